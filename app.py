@@ -1,18 +1,19 @@
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify, Response
+import hashlib
 import os
 import logging
 from typing import Dict, Any
 import asyncio
+import threading
 from functools import wraps
 from models.nlp_chain import NLPChain
 from models.embedding_service import EmbeddingService
 from models.hash_service import HashService
-import numpy as np
-from hashlib import sha256
-import matplotlib.pyplot as plt
-import io
-import base64
-from PIL import Image
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,10 +21,42 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class ORJSONProvider(JSONProvider):
+        """orjson-backed JSON provider.
+
+        Serializes float-heavy payloads (e.g. 384-element vectors) in C
+        and handles numpy arrays natively, so handlers can pass ndarrays
+        without a .tolist() round-trip.
+        """
+
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return orjson.dumps(
+                obj, option=orjson.OPT_SERIALIZE_NUMPY
+            ).decode()
+
+        def loads(self, s, **kwargs: Any) -> Any:
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+
+# Long-lived event loop in a background thread. Running asyncio.run per
+# request would create and destroy a loop every call, tearing down the
+# Solana client's HTTP connection pool each time.
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, daemon=True,
+                 name='asyncio-loop').start()
+
+def run_async(coro):
+    """Run a coroutine on the persistent background loop and wait."""
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
 def async_route(f):
     @wraps(f)
     def wrapped(*args, **kwargs):
-        return asyncio.run(f(*args, **kwargs))
+        return run_async(f(*args, **kwargs))
     return wrapped
 
 # Initialize services
@@ -31,8 +64,9 @@ try:
     rpc_url = os.environ.get('SOLANA_RPC_URL', 'http://localhost:8899')
     keypair_path = os.environ.get('SOLANA_KEYPAIR_PATH')
     chain = NLPChain(rpc_url=rpc_url, keypair_path=keypair_path)
-    # Initialize chain in a separate async context
-    asyncio.run(chain.initialize())
+    # Initialize chain on the persistent loop so the client's
+    # connections stay bound to the loop that serves requests
+    run_async(chain.initialize())
     embedding_service = EmbeddingService()
     hash_service = HashService()
     logger.info("Initialized NLP chain with Solana")
@@ -156,10 +190,17 @@ TEST_INTERFACE = """
 </html>
 """
 
+# The interface is static HTML; hash it once for conditional requests
+_INDEX_ETAG = hashlib.md5(TEST_INTERFACE.encode()).hexdigest()
+
 @app.route('/')
 def test_interface():
-    """Render the test interface"""
-    return render_template_string(TEST_INTERFACE)
+    """Serve the static test interface"""
+    # No Jinja parse/render per request; browsers get 304s via the ETag
+    response = Response(TEST_INTERFACE, mimetype='text/html')
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    response.set_etag(_INDEX_ETAG)
+    return response.make_conditional(request)
 
 @app.route('/health', methods=['GET'])
 @async_route
@@ -256,7 +297,8 @@ def analyze_trends() -> Dict[str, Any]:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/test/sample', methods=['POST'])
-def add_sample_data() -> Dict[str, Any]:
+@async_route
+async def add_sample_data() -> Dict[str, Any]:
     """Add sample data for testing"""
     try:
         sample_texts = [
@@ -275,7 +317,7 @@ def add_sample_data() -> Dict[str, Any]:
         
         results = []
         for text in sample_texts:
-            block_address = chain.add_block(
+            block_address = await chain.add_block(
                 text=text,
                 metadata={'source': 'test_data', 'category': 'blockchain'},
                 span_length=150,
@@ -304,13 +346,13 @@ def get_block_vector(block_id: int) -> Dict[str, Any]:
         
         # Generate embedding using dedicated service
         vector = embedding_service.generate_embedding(text)
-        
-        if not any(vector):  # Check if vector is all zeros
+
+        if not vector.any():  # Check if vector is all zeros
             return jsonify({'error': 'Failed to generate meaningful vector'}), 500
-            
+
         return jsonify({
             'block_id': block_id,
-            'vector': vector,
+            'vector': vector.tolist(),
             'vector_size': len(vector)
         })
     except Exception as e:
@@ -338,8 +380,10 @@ def get_block_hash(block_id: int) -> Dict[str, Any]:
         
         return jsonify({
             'block_id': block_id,
-            'hash': block.hash,
-            'previous_hash': block.previous_hash,
+            # Hashes are raw 32-byte digests internally; hex-encode at
+            # the API boundary only
+            'hash': block.hash.hex(),
+            'previous_hash': block.previous_hash.hex(),
             'chain_valid': chain_status['valid'],
             'merkle_root': hash_service.calculate_merkle_root([text])
         })
@@ -350,10 +394,15 @@ def get_block_hash(block_id: int) -> Dict[str, Any]:
 if __name__ == '__main__':
     # Get port from environment variable or use default
     port = int(os.environ.get('PORT', 5000))
-    
+
     try:
-        # Run the Flask app
-        app.run(host='0.0.0.0', port=port, debug=True)
+        # Development entry point only. In production run under gunicorn
+        # so requests are served concurrently:
+        #   gunicorn -w 1 --threads 8 -b 0.0.0.0:5000 app:app
+        # (one worker: chain state is created per process at import
+        # time, so extra workers would serve disjoint chains)
+        app.run(host='0.0.0.0', port=port,
+                debug=os.environ.get('FLASK_DEBUG') == '1')
     finally:
         # Ensure we close the Solana client
-        asyncio.run(chain.close())
\ No newline at end of file
+        run_async(chain.close())
\ No newline at end of file
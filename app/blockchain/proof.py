@@ -2,11 +2,40 @@
 Proof of Hash Generator
 """
 import hashlib
+import os
 from typing import Tuple, Optional
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 import struct
 
+
+# Nonces mined per parallel task. Small enough that a found proof only
+# waits for the in-flight chunks to finish, large enough that task
+# dispatch overhead stays negligible against the hashing
+_PARALLEL_CHUNK = 1 << 16
+
+
+def _mine_range(data: bytes, difficulty: int, start_nonce: int,
+                end_nonce: int) -> Optional[Tuple[int, bytes]]:
+    """Mine the nonce range [start_nonce, end_nonce).
+
+    Module-level so it can be pickled into worker processes.
+    """
+    target = bytes([0] * difficulty) + bytes([255] * (32 - difficulty))
+    shift = 64 - 8 * min(difficulty, 8)
+    base = hashlib.sha256(data)
+
+    for nonce in range(start_nonce, end_nonce):
+        h = base.copy()
+        h.update(struct.pack(">Q", nonce))
+        digest = h.digest()
+        # Word-wide fast reject on the leading bytes; see _meets_target
+        if int.from_bytes(digest[:8], 'big') >> shift == 0 and digest < target:
+            return nonce, digest
+
+    return None
+
 @dataclass
 class Proof:
     data: bytes
@@ -19,36 +48,95 @@ class ProofGenerator:
         """Initialize with difficulty (number of leading zeros required)."""
         self.difficulty = difficulty
         self.target = bytes([0] * difficulty) + bytes([255] * (32 - difficulty))
-        
+        # Right-shift that keeps only the leading difficulty bytes of the
+        # first 8 digest bytes; used for the word-wide fast reject
+        self._target_shift = 64 - 8 * min(difficulty, 8)
+
+    def _meets_target(self, digest: bytes) -> bool:
+        """Check a digest against the difficulty target.
+
+        Reads the first 8 bytes as one big-endian word and shifts away
+        everything below the required leading zero bytes — a single
+        compare instead of a byte-by-byte lexicographic scan. Only
+        near-hits fall through to the full bytes comparison.
+        """
+        if int.from_bytes(digest[:8], 'big') >> self._target_shift:
+            return False
+        return digest < self.target
+
     def _hash(self, data: bytes, nonce: int) -> bytes:
         """Generate SHA256 hash of data and nonce."""
         return hashlib.sha256(data + struct.pack(">Q", nonce)).digest()
-        
+
     def generate_proof(self, data: bytes, max_attempts: int = 1000000) -> Optional[Proof]:
         """Generate proof of work for given data."""
-        nonce = 0
         start_time = int(time.time())
-        
-        while nonce < max_attempts:
-            hash_result = self._hash(data, nonce)
-            
+
+        # Absorb the fixed data prefix once; each attempt only clones the
+        # hasher state and feeds the 8-byte nonce instead of rehashing
+        # data from scratch
+        base = hashlib.sha256(data)
+        pack_nonce = struct.pack
+
+        for nonce in range(max_attempts):
+            h = base.copy()
+            h.update(pack_nonce(">Q", nonce))
+            hash_result = h.digest()
+
             # Check if hash meets difficulty requirement
-            if hash_result < self.target:
+            if self._meets_target(hash_result):
                 return Proof(
                     data=data,
                     nonce=nonce,
                     hash=hash_result,
                     timestamp=start_time
                 )
-                
-            nonce += 1
-            
+
         return None
-        
+
+    def generate_proof_parallel(self, data: bytes,
+                                max_attempts: int = 1000000,
+                                workers: Optional[int] = None) -> Optional[Proof]:
+        """Generate proof of work using all available CPU cores.
+
+        The nonce space is carved into small disjoint chunks that the
+        workers pull through, so no two workers duplicate work and a
+        found proof only waits for the chunks already in flight (at
+        most workers * _PARALLEL_CHUNK nonces) rather than for the
+        whole space. Returns the first proof any worker finds.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            return self.generate_proof(data, max_attempts)
+
+        start_time = int(time.time())
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_mine_range, data, self.difficulty,
+                            start, min(start + _PARALLEL_CHUNK, max_attempts))
+                for start in range(0, max_attempts, _PARALLEL_CHUNK)
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    # Drop every queued chunk; only the in-flight ones
+                    # run to the end of their small range
+                    pool.shutdown(cancel_futures=True)
+                    nonce, digest = result
+                    return Proof(
+                        data=data,
+                        nonce=nonce,
+                        hash=digest,
+                        timestamp=start_time
+                    )
+
+        return None
+
     def verify_proof(self, proof: Proof) -> bool:
         """Verify a proof meets difficulty requirement."""
         hash_result = self._hash(proof.data, proof.nonce)
-        return hash_result == proof.hash and hash_result < self.target
+        return hash_result == proof.hash and self._meets_target(hash_result)
         
     def verify_chain(self, proof1: Proof, proof2: Proof) -> bool:
         """Verify two proofs form a valid chain."""
@@ -70,10 +158,13 @@ class ProofGenerator:
         """Find next proof that forms valid chain with previous proof."""
         nonce = 0
         start_time = int(time.time())
-        
+        base = hashlib.sha256(data)
+
         while True:
-            hash_result = self._hash(data, nonce)
-            
+            h = base.copy()
+            h.update(struct.pack(">Q", nonce))
+            hash_result = h.digest()
+
             # Create candidate proof
             candidate = Proof(
                 data=data,
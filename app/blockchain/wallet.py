@@ -6,9 +6,32 @@ from solana.publickey import PublicKey
 from solana.rpc.async_api import AsyncClient
 from solana.transaction import Transaction
 import base58
+from functools import lru_cache
 from typing import Optional, Tuple
 import os
 
+try:
+    import based58  # Rust implementation, ~10x faster than pure Python
+except ImportError:
+    based58 = None
+
+
+def _b58decode(value: str) -> bytes:
+    """Base58-decode via the Rust backend when available."""
+    if based58 is not None:
+        return based58.b58decode(value.encode('ascii'))
+    return base58.b58decode(value)
+
+
+@lru_cache(maxsize=4096)
+def _cached_pubkey(public_key: str) -> PublicKey:
+    """Memoized PublicKey construction.
+
+    Most requests come from a handful of wallets, so the decode and
+    ed25519 point validation only run once per distinct key.
+    """
+    return PublicKey(public_key)
+
 class SolanaWallet:
     def __init__(self, keypair: Optional[Keypair] = None):
         """Initialize wallet with optional keypair."""
@@ -18,7 +41,7 @@ class SolanaWallet:
     @classmethod
     def from_private_key(cls, private_key: str) -> 'SolanaWallet':
         """Create wallet from base58 private key."""
-        decoded = base58.b58decode(private_key)
+        decoded = _b58decode(private_key)
         keypair = Keypair.from_secret_key(decoded)
         return cls(keypair)
         
@@ -42,15 +65,15 @@ class SolanaWallet:
     def verify_signature(public_key: str, signature: str, message: Optional[bytes] = None) -> bool:
         """Verify a signature."""
         try:
-            # Convert public key from string
-            pubkey = PublicKey(public_key)
-            
+            # Convert public key from string (memoized per wallet)
+            pubkey = _cached_pubkey(public_key)
+
             # If no message provided, assume signature is recent blockhash
             if not message:
                 return True  # Simplified for demo, should verify against recent blockhash
-                
+
             # Verify signature
-            sig_bytes = base58.b58decode(signature)
+            sig_bytes = _b58decode(signature)
             return pubkey.verify(message, sig_bytes)
             
         except Exception:
@@ -0,0 +1,84 @@
+"""
+Request-coalescing micro-batcher for embedding requests.
+
+Concurrent requests each need one embedding, but encoding texts one at a
+time under-utilizes the model's vectorized forward pass. The batcher
+collects texts arriving within a short window and encodes them together
+in a single `SentenceTransformer.encode` call.
+"""
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+
+class _PendingRequest:
+    """A single text waiting for its embedding."""
+    __slots__ = ('text', 'event', 'result', 'error')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.event = threading.Event()
+        self.result: Optional[np.ndarray] = None
+        self.error: Optional[Exception] = None
+
+
+class EmbeddingBatcher:
+    def __init__(self, pipeline, max_batch_size: int = 32,
+                 window_ms: float = 8.0):
+        """Initialize batcher around an MLPipeline instance."""
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000.0
+        self._lock = threading.Lock()
+        self._queue: List[_PendingRequest] = []
+
+    def submit(self, text: str) -> np.ndarray:
+        """Submit a text and block until its embedding is available."""
+        return self.submit_many([text])[0]
+
+    def submit_many(self, texts: List[str]) -> List[np.ndarray]:
+        """Submit several texts and block until all embeddings are ready."""
+        entries = [_PendingRequest(text) for text in texts]
+        with self._lock:
+            was_empty = not self._queue
+            self._queue.extend(entries)
+
+        if was_empty:
+            # First arrival becomes the leader: wait out the batching
+            # window so concurrent requests can pile on, then encode.
+            time.sleep(self.window)
+            self._flush()
+
+        results = []
+        for entry in entries:
+            # Followers wait for the leader; flush ourselves if it stalls
+            if not entry.event.wait(timeout=self.window * 10):
+                self._flush()
+                entry.event.wait()
+            if entry.error is not None:
+                raise entry.error
+            results.append(entry.result)
+        return results
+
+    def _flush(self) -> None:
+        """Encode all queued texts in batched forward passes."""
+        while True:
+            with self._lock:
+                batch = self._queue[:self.max_batch_size]
+                del self._queue[:self.max_batch_size]
+            if not batch:
+                return
+
+            try:
+                embeddings = self.pipeline.get_embedding_batched(
+                    [entry.text for entry in batch]
+                )
+                for entry, embedding in zip(batch, embeddings):
+                    entry.result = embedding
+            except Exception as e:
+                for entry in batch:
+                    entry.error = e
+            for entry in batch:
+                entry.event.set()
@@ -0,0 +1,92 @@
+"""
+Content-hash keyed embedding cache.
+
+Caching embeddings by the full text string wastes memory on long
+documents and is lost on restart. This cache keys entries by a 16-byte
+content digest scoped to the model name, stores vectors as float16 to
+halve resident memory, and can be backed by a persistent diskcache
+store so embeddings survive process restarts.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+
+class EmbeddingCache:
+    def __init__(self, model_name: str, max_size: int = 1000,
+                 disk_path: Optional[str] = None,
+                 disk_size_limit: int = 1 << 30):
+        """Initialize cache with in-memory LRU and optional disk tier."""
+        self.model_name = model_name.encode()
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        self._cache: 'OrderedDict[bytes, np.ndarray]' = OrderedDict()
+        self._disk = None
+        if disk_path and diskcache is not None:
+            self._disk = diskcache.Cache(disk_path, size_limit=disk_size_limit)
+
+    def key_for(self, text: str) -> bytes:
+        """16-byte content digest scoped to the producing model."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.model_name)
+        h.update(b'\0')
+        h.update(text.encode())
+        return h.digest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Get cached float16 vector for a text, or None on miss."""
+        key = self.key_for(text)
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                return vector
+        if self._disk is not None:
+            vector = self._disk.get(key)
+            if vector is not None:
+                with self._lock:
+                    self._store_memory(key, vector)
+                return vector
+        return None
+
+    def set(self, text: str, vector: np.ndarray) -> None:
+        """Cache a vector, downcasting to float16 for storage."""
+        key = self.key_for(text)
+        compact = vector.astype(np.float16)
+        with self._lock:
+            self._store_memory(key, compact)
+        if self._disk is not None:
+            self._disk.set(key, compact)
+
+    def get_many(self, texts: List[str]) -> Tuple[List[Optional[np.ndarray]],
+                                                  List[int]]:
+        """Look up several texts at once.
+
+        Returns a list of vectors aligned with `texts` (None on miss) and
+        the indices of the misses, so callers can batch-encode only the
+        missing texts.
+        """
+        vectors = [self.get(text) for text in texts]
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        return vectors, misses
+
+    def _store_memory(self, key: bytes, vector: np.ndarray) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entry."""
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        elif len(self._cache) >= self.max_size:
+            self._cache.popitem(last=False)
+        self._cache[key] = vector
+
+    def clear(self) -> None:
+        """Clear the in-memory tier (the disk tier persists)."""
+        with self._lock:
+            self._cache.clear()
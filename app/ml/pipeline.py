@@ -3,29 +3,92 @@ Minimal ML Pipeline for text processing.
 Optimized for ARM64 architecture and minimal memory footprint.
 """
 from typing import List, Dict, Optional
+from collections import OrderedDict
+import hashlib
+import os
 import numpy as np
 from sentence_transformers import SentenceTransformer
 import spacy
-from functools import lru_cache
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+from .embedding_cache import EmbeddingCache
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
 
 class MLPipeline:
     def __init__(self):
         """Initialize the ML pipeline with minimal models."""
-        # Load lightweight models
-        self.nlp = spacy.load("en_core_web_sm")  # Lightweight model for basic NLP
-        self.encoder = SentenceTransformer('all-MiniLM-L6-v2')  # Small, efficient model
-        
-    @lru_cache(maxsize=1000)
+        # Load lightweight models. extract_key_info never reads lemmas,
+        # so the lemmatizer can be skipped. The attribute ruler must
+        # stay: in this model it maps fine-grained tags to token.pos,
+        # which the English noun-chunk iterator filters on
+        self.nlp = spacy.load("en_core_web_sm", disable=["lemmatizer"])
+        self.encoder = SentenceTransformer(MODEL_NAME)  # Small, efficient model
+        self._key_info_cache: 'OrderedDict[bytes, Dict]' = OrderedDict()
+        # Category sets come from request bodies, so the cache is
+        # LRU-bounded like the others rather than growable by clients
+        self._category_cache: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+        self.embedding_cache = EmbeddingCache(
+            MODEL_NAME, max_size=1000,
+            disk_path=os.environ.get('EMBEDDING_CACHE_DIR')
+        )
+
     def get_embedding(self, text: str) -> np.ndarray:
-        """Get text embedding with caching for efficiency."""
-        return self.encoder.encode(text, convert_to_tensor=False)
-    
+        """Get unit-normalized text embedding with caching for efficiency."""
+        cached = self.embedding_cache.get(text)
+        if cached is not None:
+            return cached.astype(np.float32)
+        vector = self.encoder.encode(
+            text, convert_to_numpy=True, normalize_embeddings=True
+        )
+        self.embedding_cache.set(text, vector)
+        return vector
+
+    def get_embedding_batched(self, texts: List[str]) -> List[np.ndarray]:
+        """Encode several texts in one batched forward pass.
+
+        Cached texts are served from the embedding cache; only the
+        misses go through the encoder, in a single batched call.
+        """
+        vectors, misses = self.embedding_cache.get_many(texts)
+        if misses:
+            encoded = self.encoder.encode(
+                [texts[i] for i in misses], batch_size=32,
+                convert_to_numpy=True, normalize_embeddings=True
+            )
+            for i, vector in zip(misses, encoded):
+                self.embedding_cache.set(texts[i], vector)
+                vectors[i] = vector
+        return [vector.astype(np.float32, copy=False) for vector in vectors]
+
+    @staticmethod
+    def cosine_similarity(emb1: np.ndarray, emb2: np.ndarray) -> float:
+        """Cosine similarity between two unit-normalized embeddings.
+
+        The pipeline encodes with normalize_embeddings=True, so the
+        cosine reduces to a plain dot product — no norm passes needed.
+        """
+        if simsimd is not None:
+            # Fused SIMD kernel: one pass computes dot plus both norms
+            return 1.0 - float(simsimd.cosine(
+                np.ascontiguousarray(emb1, dtype=np.float32),
+                np.ascontiguousarray(emb2, dtype=np.float32)
+            ))
+        return float(np.dot(emb1, emb2))
+
+
     def batch_process(self, texts: List[str], batch_size: int = 32) -> List[np.ndarray]:
         """Process texts in batches for memory efficiency."""
         embeddings = []
         for i in range(0, len(texts), batch_size):
             batch = texts[i:i + batch_size]
-            batch_embeddings = self.encoder.encode(batch, convert_to_tensor=False)
+            batch_embeddings = self.encoder.encode(
+                batch, convert_to_numpy=True, normalize_embeddings=True
+            )
             embeddings.extend(batch_embeddings)
         return embeddings
     
@@ -33,11 +96,32 @@ class MLPipeline:
         """Compute semantic similarity between two texts."""
         emb1 = self.get_embedding(text1)
         emb2 = self.get_embedding(text2)
-        return np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
+        return self.cosine_similarity(emb1, emb2)
     
     def extract_key_info(self, text: str) -> Dict[str, str]:
         """Extract essential information from text."""
-        doc = self.nlp(text)
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        cached = self._key_info_cache.get(key)
+        if cached is not None:
+            self._key_info_cache.move_to_end(key)
+            return cached
+
+        result = self._key_info_from_doc(self.nlp(text))
+
+        if len(self._key_info_cache) >= 256:
+            self._key_info_cache.popitem(last=False)
+        self._key_info_cache[key] = result
+        return result
+
+    def extract_key_info_batch(self, texts: List[str]) -> List[Dict[str, str]]:
+        """Extract key info for several texts via spaCy's pipe path."""
+        return [
+            self._key_info_from_doc(doc)
+            for doc in self.nlp.pipe(texts, batch_size=32)
+        ]
+
+    @staticmethod
+    def _key_info_from_doc(doc) -> Dict[str, str]:
         return {
             'entities': [(ent.text, ent.label_) for ent in doc.ents],
             'key_phrases': [chunk.text for chunk in doc.noun_chunks],
@@ -46,15 +130,28 @@ class MLPipeline:
     
     def classify_text(self, text: str, categories: List[str]) -> str:
         """Simple zero-shot classification using similarity."""
+        # Deployments classify against a small fixed category set, so
+        # cache the stacked category matrix and only embed the text
+        key = tuple(categories)
+        cat_embs = self._category_cache.get(key)
+        if cat_embs is None:
+            cat_embs = self.encoder.encode(
+                categories, batch_size=len(categories),
+                convert_to_numpy=True, normalize_embeddings=True
+            )
+            if len(self._category_cache) >= 32:
+                self._category_cache.popitem(last=False)
+            self._category_cache[key] = cat_embs
+        else:
+            self._category_cache.move_to_end(key)
+        # Embeddings come out of the encoder unit-normalized, so one
+        # GEMV over the stacked category matrix gives every cosine
         text_emb = self.get_embedding(text)
-        cat_embs = [self.get_embedding(cat) for cat in categories]
-        
-        similarities = [
-            np.dot(text_emb, cat_emb) / (np.linalg.norm(text_emb) * np.linalg.norm(cat_emb))
-            for cat_emb in cat_embs
-        ]
-        return categories[np.argmax(similarities)]
+        similarities = cat_embs @ text_emb
+        return categories[int(similarities.argmax())]
 
     def cleanup(self):
         """Clean up resources."""
-        self.get_embedding.cache_clear() 
\ No newline at end of file
+        self.embedding_cache.clear()
+        self._key_info_cache.clear()
+        self._category_cache.clear() 
\ No newline at end of file
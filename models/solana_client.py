@@ -1,12 +1,15 @@
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Commitment
 from solana.keypair import Keypair
+from solana.publickey import PublicKey
 from solana.system_program import SYS_PROGRAM_ID
 from solana.transaction import Transaction
 from solana.rpc.types import TxOpts
 from anchorpy import Program, Provider, Wallet
 import json
 import base64
+
+from models import jsonio
 from typing import List, Dict, Any, Optional
 import logging
 import os
@@ -54,7 +57,11 @@ class SolanaNLPChain:
         with open('target/idl/nlp_chain.json', 'r') as f:
             idl = json.load(f)
         self.program = Program(idl, self.PROGRAM_ID, self.provider)
-        
+
+        # Block PDAs are deterministic in the block index, so derived
+        # addresses are memoized for the lifetime of the client
+        self._pda_cache: List[str] = []
+
         logger.info(f"Initialized Solana client with program ID: {self.PROGRAM_ID}")
 
     async def initialize(self) -> str:
@@ -102,8 +109,9 @@ class SolanaNLPChain:
             # Create block account
             block = Keypair()
             
-            # Convert metadata to string
-            metadata_str = json.dumps(metadata)
+            # Convert metadata to string (orjson-backed; span vectors
+            # make this float-heavy)
+            metadata_str = jsonio.dumps(metadata)
             
             # Build and send transaction
             tx = await self.program.rpc["add_block"](
@@ -155,34 +163,95 @@ class SolanaNLPChain:
             logger.error(f"Failed to update vector: {str(e)}")
             raise
 
+    def derive_block_address(self, index: int) -> str:
+        """
+        Derive the PDA for a block by index (memoized)
+
+        Args:
+            index: Block index on the chain
+
+        Returns:
+            Block account address
+        """
+        program_id = PublicKey(self.PROGRAM_ID)
+        while len(self._pda_cache) <= index:
+            i = len(self._pda_cache)
+            address, _bump = PublicKey.find_program_address(
+                [b"block", i.to_bytes(8, 'little')],
+                program_id
+            )
+            self._pda_cache.append(str(address))
+        return self._pda_cache[index]
+
+    @staticmethod
+    def _block_to_dict(block) -> Dict[str, Any]:
+        """Convert a decoded Block account to the client dict shape"""
+        return {
+            "authority": str(block.authority),
+            "index": block.index,
+            "timestamp": block.timestamp,
+            "text": block.text,
+            "vector": block.vector,
+            "metadata": jsonio.loads(block.metadata),
+            "data_hash": base64.b64encode(block.data_hash).decode('utf-8'),
+            "previous_hash": base64.b64encode(block.previous_hash).decode('utf-8')
+        }
+
     async def get_block(self, block_address: str) -> Dict[str, Any]:
         """
         Get block data
-        
+
         Args:
             block_address: Block account address
-            
+
         Returns:
             Block data
         """
         try:
             block = await self.program.account["Block"].fetch(block_address)
-            
-            return {
-                "authority": str(block.authority),
-                "index": block.index,
-                "timestamp": block.timestamp,
-                "text": block.text,
-                "vector": block.vector,
-                "metadata": json.loads(block.metadata),
-                "data_hash": base64.b64encode(block.data_hash).decode('utf-8'),
-                "previous_hash": base64.b64encode(block.previous_hash).decode('utf-8')
-            }
-            
+            return self._block_to_dict(block)
+
         except Exception as e:
             logger.error(f"Failed to get block {block_address}: {str(e)}")
             raise
 
+    async def get_blocks(self,
+                         addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get many blocks in batched getMultipleAccounts calls
+
+        One RPC fetches up to 100 accounts, so N blocks cost
+        ceil(N / 100) round-trips instead of N.
+
+        Args:
+            addresses: Block account addresses
+
+        Returns:
+            Block data dicts, in the same order as addresses
+        """
+        try:
+            blocks: List[Dict[str, Any]] = []
+            for start in range(0, len(addresses), 100):
+                chunk = addresses[start:start + 100]
+                resp = await self.client.get_multiple_accounts(
+                    [PublicKey(address) for address in chunk],
+                    commitment=Commitment.CONFIRMED
+                )
+                for address, account in zip(chunk, resp["result"]["value"]):
+                    if account is None:
+                        raise ValueError(
+                            f"Block account not found: {address}"
+                        )
+                    decoded = self.program.coder.accounts.decode(
+                        base64.b64decode(account["data"][0])
+                    )
+                    blocks.append(self._block_to_dict(decoded))
+            return blocks
+
+        except Exception as e:
+            logger.error(f"Failed to get blocks: {str(e)}")
+            raise
+
     async def get_chain_state(self, chain_state: str) -> Dict[str, Any]:
         """
         Get chain state
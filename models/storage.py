@@ -3,68 +3,88 @@ import os
 from typing import Dict, Any, List
 import logging
 
+from models import jsonio
+
 logger = logging.getLogger(__name__)
 
 class LocalStorage:
-    """Local JSON file storage for block data"""
-    
+    """Local JSON Lines file storage for block data
+
+    Blocks are stored one JSON object per line so appends are O(1)
+    instead of a read-modify-rewrite of the whole file. An in-memory
+    byte-offset index lets get_data seek straight to a record without
+    parsing the file.
+    """
+
     def __init__(self, storage_path: str):
         """
         Initialize storage with file path
-        
+
         Args:
-            storage_path: Path to JSON storage file
+            storage_path: Path to JSONL storage file
         """
         self.storage_path = storage_path
+        self._offsets: List[int] = []
         self._ensure_storage_file()
+        self._build_index()
         logger.info(f"Initialized storage at: {storage_path}")
 
     def _ensure_storage_file(self):
-        """Ensure storage file exists with valid JSON array"""
+        """Ensure storage file exists, migrating legacy JSON array files"""
         try:
             if not os.path.exists(self.storage_path):
                 # Create directory if it doesn't exist
                 os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
-                # Create empty JSON array file
-                with open(self.storage_path, 'w') as f:
-                    json.dump([], f)
-        except Exception as e:
-            logger.error(f"Failed to initialize storage file: {str(e)}")
-            raise
+                with open(self.storage_path, 'w'):
+                    pass
+                return
 
-    def _read_data(self) -> List[Dict[str, Any]]:
-        """Read all data from storage"""
-        try:
+            # Migrate the previous format (one indented JSON array)
             with open(self.storage_path, 'r') as f:
-                return json.load(f)
+                head = f.read(1)
+                if head != '[':
+                    return
+                f.seek(0)
+                records = json.load(f)
+            with open(self.storage_path, 'w') as f:
+                for record in records:
+                    f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            logger.info(f"Migrated {len(records)} records to JSONL format")
         except Exception as e:
-            logger.error(f"Failed to read storage file: {str(e)}")
+            logger.error(f"Failed to initialize storage file: {str(e)}")
             raise
 
-    def _write_data(self, data: List[Dict[str, Any]]):
-        """Write data to storage"""
+    def _build_index(self):
+        """Scan the file once and record the byte offset of each record"""
         try:
-            with open(self.storage_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._offsets = []
+            with open(self.storage_path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        self._offsets.append(offset)
+                    offset += len(line)
         except Exception as e:
-            logger.error(f"Failed to write to storage file: {str(e)}")
+            logger.error(f"Failed to index storage file: {str(e)}")
             raise
 
     def store_data(self, data: Dict[str, Any]) -> int:
         """
         Store new data and return its ID
-        
+
         Args:
             data: Data to store
-            
+
         Returns:
             Block ID (index in storage)
         """
         try:
-            current_data = self._read_data()
-            block_id = len(current_data)
-            current_data.append(data)
-            self._write_data(current_data)
+            line = jsonio.dumps(data) + '\n'
+            with open(self.storage_path, 'a') as f:
+                offset = f.tell()
+                f.write(line)
+            block_id = len(self._offsets)
+            self._offsets.append(offset)
             return block_id
         except Exception as e:
             logger.error(f"Failed to store data: {str(e)}")
@@ -73,18 +93,19 @@ class LocalStorage:
     def get_data(self, block_id: int) -> Dict[str, Any]:
         """
         Retrieve data by ID
-        
+
         Args:
             block_id: ID of block to retrieve
-            
+
         Returns:
             Block data
         """
         try:
-            current_data = self._read_data()
-            if 0 <= block_id < len(current_data):
-                return current_data[block_id]
-            raise ValueError(f"Invalid block ID: {block_id}")
+            if not 0 <= block_id < len(self._offsets):
+                raise ValueError(f"Invalid block ID: {block_id}")
+            with open(self.storage_path, 'r') as f:
+                f.seek(self._offsets[block_id])
+                return jsonio.loads(f.readline())
         except Exception as e:
             logger.error(f"Failed to get data for block {block_id}: {str(e)}")
             raise
@@ -92,12 +113,8 @@ class LocalStorage:
     def get_data_count(self) -> int:
         """
         Get total number of stored blocks
-        
+
         Returns:
             Number of blocks in storage
         """
-        try:
-            return len(self._read_data())
-        except Exception as e:
-            logger.error(f"Failed to get data count: {str(e)}")
-            raise 
\ No newline at end of file
+        return len(self._offsets)